@@ -5,201 +5,327 @@ Global Trace Generator with D3.js for CPS Traceability Framework
 This script generates an interactive D3.js visualization with draggable nodes.
 """
 
-import xml.etree.ElementTree as ET
-from typing import Dict, List
+from collections import Counter, defaultdict, deque, namedtuple
+from functools import lru_cache
+from itertools import chain
+from operator import methodcaller
+from typing import Dict, Tuple
 import argparse
+import gzip
 import json
+import re
+import shutil
+import sys
+
+try:
+    # lxml (libxml2) parses large megamodels much faster than the stdlib parser
+    from lxml import etree as ET
+    child_finder = ET.XPath  # compiled once, reused for every element
+
+    def iter_top_level_nodes(path: str):
+        """Yield each <nodes> child of the root element once it has been parsed"""
+        # Passing the path lets lxml read the file natively rather than through a Python file object
+        for _, elem in ET.iterparse(path, events=('end',), tag='nodes', huge_tree=True):
+            parent = elem.getparent()
+            if parent is not None and parent.getparent() is None:
+                yield elem
+
+    def release_element(elem):
+        """Free a processed element and the already-processed siblings before it"""
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    def iter_top_level_nodes(path: str):
+        """Yield each <nodes> child of the root element once it has been parsed"""
+        depth = 0
+        for event, elem in ET.iterparse(path, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1 and elem.tag == 'nodes':
+                yield elem
+
+    def child_finder(tag: str):
+        return methodcaller('findall', tag)
+
+    def release_element(elem):
+        """Free a processed element's attributes and children"""
+        elem.clear()
+
+try:
+    # orjson serializes the embedded graph several times faster than the stdlib encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+# Interned so type dispatch compares by identity
+XMI_TYPE = sys.intern('{http://www.omg.org/XMI}type')
+MODEL_TYPE = sys.intern('mpm_trace:Model')
+TRACE_MODEL_TYPE = sys.intern('mpm_trace:TraceModel')
+TRANSFORMATION_TYPE = sys.intern('mpm_trace:Transformation')
+EXECUTION_TYPE = sys.intern('mpm_trace:TransformationExecution')
+
+# Fallback shown for names and abstraction levels that cannot be resolved
+UNKNOWN = 'Unknown'
+
+# Fill colours per LevelOfAbstraction: purple for PIM, green for PSM, yellow for Code
+ABSTRACTION_COLORS = {'PIM': '#9C27B0', 'PSM': '#4CAF50', 'Code': '#FFC107', UNKNOWN: '#666'}
+
+# Column order of the per-type node tables embedded in the page (the type is per table)
+MODEL_NODE_KEYS = ('id', 'name', 'metamodel', 'level', 'LevelOfAbstraction', 'fill')
+TRACE_NODE_KEYS = ('id', 'name', 'transformation', 'input_models', 'output_models', 'num_rules',
+                   'num_element_traces', 'num_attribute_traces', 'level', 'version',
+                   'LevelOfAbstraction')
+TRACE_LINK_NODE_KEYS = ('id', 'name', 'sourceElementPath', 'targetElementPath', 'linkType', 'level',
+                        'parent_trace_id', 'LevelOfAbstraction', 'fill')
+# Link tables use the same layout; tables whose links share a type carry it once
+LINK_KEYS = ('source', 'target', 'type')
+LINK_ENDPOINT_KEYS = ('source', 'target')
+
+# Element/attribute trace links are kept as compact records, read in XMI attribute order
+TRACE_LINK_ATTRIBUTES = ('name', 'sourceElementPath', 'targetElementPath', 'sourceAttribute',
+                         'targetAttribute', 'linkType')
+TraceLink = namedtuple('TraceLink', 'name source_path target_path source_attr target_attr link_type')
+# Traced rules and their intents are compact records too; absent children are empty tuples
+TracedRule = namedtuple('TracedRule', 'name intents trace_links')
+Intent = namedtuple('Intent', 'name params')
+
+FIND_CONTAINS = child_finder('contains')
+FIND_INTENTS = child_finder('intents')
+FIND_PARAMS = child_finder('params')
+FIND_TRACE_LINKS = child_finder('traceLinks')
+
+
+# '<' only occurs inside JSON strings, where \u003c is equivalent, so escaping it
+# keeps names from closing or commenting out the <script> block holding the JSON
+def dumps_embedded_json(obj) -> str:
+    """Serialize obj as compact JSON for embedding in HTML, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8').replace('<', '\\u003c')
+    return json.dumps(obj, separators=(',', ':')).replace('<', '\\u003c')
+
+
+def dump_embedded_json(obj, f):
+    """Write obj as compact JSON for embedding in HTML to the binary stream f"""
+    if orjson is not None:
+        f.write(orjson.dumps(obj).replace(b'<', b'\\u003c'))
+        return
+    for chunk in json.JSONEncoder(separators=(',', ':')).iterencode(obj):
+        f.write(chunk.replace('<', '\\u003c').encode('utf-8'))
 
 
 class GlobalTraceGeneratorD3:
-    def __init__(self, example_xml_path: str):
+    def __init__(self, example_xml_path: str, debug: bool = False):
         self.example_path = example_xml_path
-        self.tree = ET.parse(example_xml_path)
-        self.root = self.tree.getroot()
-        self.nodes = {}
+        self.debug = debug
+        self.names = []  # name attribute of every <nodes> element, by index
+        self.node_indices = range(0)
         self.trace_models = {}
         self.transformations = {}
         self.executions = {}
         self.models = {}  # Store Model nodes
 
-    def parse_nodes(self):
-        """Parse all nodes and index them"""
-        for idx, node in enumerate(self.root.findall('nodes')):
-            self.nodes[idx] = node
-
-    def extract_models(self):
-        """Extract all Model nodes"""
-        for idx, node in self.nodes.items():
-            if node.get('{http://www.omg.org/XMI}type') == 'mpm_trace:Model':
-                name = node.get('name')
-                conforms_to = node.get('conformsTo')
-                associated_with = node.get('associatedWith')
-                in_ref = node.get('In')  # Transformations this model is input to
-                level_of_abstraction = node.get('LevelOfAbstraction')  # PIM, PSM, or Code
-
-                self.models[idx] = {
-                    'index': idx,
-                    'name': name,
-                    'conformsTo': conforms_to,
-                    'associatedWith': associated_with,
-                    'In': in_ref,
-                    'LevelOfAbstraction': level_of_abstraction
-                }
+    def extract_all(self):
+        """Stream the XML once, extracting Models, TraceModels, Transformations and Executions"""
+        handlers = {
+            MODEL_TYPE: self._handle_model,
+            TRACE_MODEL_TYPE: self._handle_trace_model,
+            EXECUTION_TYPE: self._handle_execution,
+            TRANSFORMATION_TYPE: self._handle_transformation
+        }
+        names = self.names
+
+        # The position of each <nodes> child of the root matches its //@nodes.N references;
+        # <nodes> elements nested deeper are not counted
+        for elem in iter_top_level_nodes(self.example_path):
+            idx = len(names)
+            names.append(elem.get('name'))
+
+            handler = handlers.get(sys.intern(elem.get(XMI_TYPE) or ''))
+            if handler:
+                handler(idx, elem)
+
+            # Everything later passes need now lives in self.names and the extracted dicts
+            release_element(elem)
+
+        self.node_indices = range(len(names))
+        self._link_model_inputs()
+
+    def _handle_model(self, idx: int, node):
+        """Extract a Model node"""
+        name = self.names[idx]
+        conforms_to = node.get('conformsTo')
+        associated_with = node.get('associatedWith')
+        in_ref = node.get('In')  # Transformations this model is input to
+        level_of_abstraction = node.get('LevelOfAbstraction')  # PIM, PSM, or Code
+
+        self.models[idx] = {
+            'index': idx,
+            'name': name,
+            'conformsTo': conforms_to,
+            'associatedWith': associated_with,
+            'In': in_ref,
+            'LevelOfAbstraction': level_of_abstraction
+        }
 
-    def extract_trace_models(self):
-        """Extract all TraceModel nodes"""
-        for idx, node in self.nodes.items():
-            if node.get('{http://www.omg.org/XMI}type') == 'mpm_trace:TraceModel':
-                name = node.get('name')
-                conforms_to = node.get('conformsTo')
-                ancestor = node.get('ancestor')  # Extract ancestor link
-                version = node.get('version')  # Extract version attribute
-
-                traced_rules = []
-                for rule in node.findall('contains'):
-                    rule_data = {
-                        'name': rule.get('name'),
-                        'intents': [],
-                        'trace_links': []
-                    }
-
-                    for intent in rule.findall('intents'):
-                        intent_data = {
-                            'name': intent.get('name'),
-                            'params': [p.get('name') for p in intent.findall('params')]
-                        }
-                        rule_data['intents'].append(intent_data)
-
-                    for link in rule.findall('traceLinks'):
-                        link_data = {
-                            'name': link.get('name'),
-                            'sourceElementPath': link.get('sourceElementPath'),
-                            'targetElementPath': link.get('targetElementPath'),
-                            'sourceAttribute': link.get('sourceAttribute'),
-                            'targetAttribute': link.get('targetAttribute'),
-                            'linkType': link.get('linkType')
-                        }
-                        rule_data['trace_links'].append(link_data)
-
-                    traced_rules.append(rule_data)
-
-                self.trace_models[idx] = {
-                    'index': idx,
-                    'name': name,
-                    'conformsTo': conforms_to,
-                    'ancestor': ancestor,
-                    'version': version,
-                    'traced_rules': traced_rules
-                }
+    def _handle_trace_model(self, idx: int, node):
+        """Extract a TraceModel node with its traced rules"""
+        name = self.names[idx]
+        conforms_to = node.get('conformsTo')
+        ancestor = node.get('ancestor')  # Extract ancestor link
+        version = node.get('version')  # Extract version attribute
+
+        traced_rules = [TracedRule(
+            rule.get('name'),
+            tuple(Intent(intent.get('name'), tuple(p.get('name') for p in FIND_PARAMS(intent)))
+                  for intent in FIND_INTENTS(rule)),
+            tuple(TraceLink._make(map(link.get, TRACE_LINK_ATTRIBUTES)) for link in FIND_TRACE_LINKS(rule))
+        ) for rule in FIND_CONTAINS(node)]
+
+        self.trace_models[idx] = {
+            'index': idx,
+            'name': name,
+            'conformsTo': conforms_to,
+            'ancestor': ancestor,
+            'version': version,
+            'version_int': int(version) if version is not None else 1,
+            'traced_rules': traced_rules
+        }
 
-    def extract_transformation_executions(self):
-        """Extract all TransformationExecution nodes"""
-        for idx, node in self.nodes.items():
-            if node.get('{http://www.omg.org/XMI}type') == 'mpm_trace:TransformationExecution':
-                name = node.get('name')
-                generates = node.get('generates')
-
-                self.executions[idx] = {
-                    'index': idx,
-                    'name': name,
-                    'generates': generates
-                }
+    def _handle_execution(self, idx: int, node):
+        """Extract a TransformationExecution node"""
+        name = self.names[idx]
+        generates = node.get('generates')
 
-    def extract_transformations(self):
-        """Extract all Transformation nodes and build I/O relationships"""
-        # First pass: extract transformations and their output models
-        for idx, node in self.nodes.items():
-            if node.get('{http://www.omg.org/XMI}type') == 'mpm_trace:Transformation':
-                name = node.get('name')
-                exec_ref = node.get('exec')
-
-                # Handle both old format (IN/OUT uppercase) and new format (Out capitalized)
-                in_ref = node.get('IN')
-                out_ref = node.get('OUT') or node.get('Out')  # Try both formats
-
-                self.transformations[idx] = {
-                    'index': idx,
-                    'name': name,
-                    'exec': exec_ref,
-                    'IN': in_ref,
-                    'OUT': out_ref
-                }
+        self.executions[idx] = {
+            'index': idx,
+            'name': name,
+            'generates': generates,
+            'generates_idx': self.resolve_reference(generates)
+        }
 
-        # Second pass: handle new format (In on Model, Out on Transformation)
-        # Check if any Model has 'In' relation pointing to transformations
-        for idx, node in self.nodes.items():
-            if node.get('{http://www.omg.org/XMI}type') == 'mpm_trace:Model':
-                in_ref = node.get('In')  # Model -> Transformation (input)
-                if in_ref:
-                    # This model is input to transformation(s)
-                    trans_indices = self.resolve_references_list(in_ref)
-                    for trans_idx in trans_indices:
-                        if trans_idx in self.transformations:
-                            # Add this model to transformation's inputs
-                            if not self.transformations[trans_idx]['IN']:
-                                self.transformations[trans_idx]['IN'] = f'//@nodes.{idx}'
-                            else:
-                                # Append to existing inputs
-                                self.transformations[trans_idx]['IN'] += f' //@nodes.{idx}'
-
-    def resolve_reference(self, ref_path: str) -> int:
+    def _handle_transformation(self, idx: int, node):
+        """Extract a Transformation node and its output models"""
+        name = self.names[idx]
+        exec_ref = node.get('exec')
+
+        # Handle both old format (IN/OUT uppercase) and new format (Out capitalized)
+        in_ref = node.get('IN')
+        out_ref = node.get('OUT') or node.get('Out')  # Try both formats
+
+        self.transformations[idx] = {
+            'index': idx,
+            'name': name,
+            'exec': exec_ref,
+            'exec_indices': self.resolve_references_list(exec_ref),
+            'IN': in_ref,
+            'OUT': out_ref,
+            'OUT_indices': self.resolve_references_list(out_ref)
+        }
+
+    def _link_model_inputs(self):
+        """Handle new format (In on Model, Out on Transformation)"""
+        # Needs every transformation extracted, since models may precede them
+        model_inputs = defaultdict(list)
+        for idx, model_data in self.models.items():
+            in_ref = model_data['In']  # Model -> Transformation (input)
+            if in_ref:
+                # This model is input to transformation(s)
+                for trans_idx in self.resolve_references_list(in_ref):
+                    if trans_idx in self.transformations:
+                        model_inputs[trans_idx].append(idx)
+
+        # Inputs are final now; resolve them once for every later pass
+        for trans_idx, trans_data in self.transformations.items():
+            in_indices = self.resolve_references_list(trans_data['IN'])
+            extra_inputs = model_inputs.get(trans_idx)
+            if extra_inputs:
+                in_indices += tuple(extra_inputs)
+                # Keep the reference string consistent with the resolved inputs
+                trans_data['IN'] = ' '.join(filter(None, (
+                    trans_data['IN'], *(f'//@nodes.{i}' for i in extra_inputs))))
+            trans_data['IN_indices'] = in_indices
+
+    def node_name(self, idx: int, default: str = UNKNOWN) -> str:
+        """Return the name attribute of the node at idx"""
+        name = self.names[idx]
+        return default if name is None else name
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def resolve_reference(ref_path: str) -> int:
         """Convert XPath reference to node index"""
         if not ref_path:
             return None
-        parts = ref_path.split('.')
-        if len(parts) >= 2:
-            return int(parts[-1])
-        return None
+        _, sep, tail = ref_path.rpartition('.')
+        return int(tail) if sep else None
 
-    def resolve_references_list(self, ref_path: str) -> List[int]:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def resolve_references_list(ref_path: str) -> Tuple[int, ...]:
         """Convert space-separated XPath references to node indices"""
         if not ref_path:
-            return []
-        refs = ref_path.split()
-        return [self.resolve_reference(ref) for ref in refs]
+            return ()
+        resolve = GlobalTraceGeneratorD3.resolve_reference
+        return tuple(resolve(ref) for ref in ref_path.split())
 
     def build_global_trace(self) -> Dict:
         """Build the global trace by connecting local traces via I/O dependencies"""
-        trace_to_transformation = {}
+        # Index executions by the trace they generate and transformations by
+        # their executions / input models, keeping the first match like a scan would
+        trace_models = self.trace_models
+        generates_to_exec = {}
+        for exec_idx, exec_data in self.executions.items():
+            generates_to_exec.setdefault(exec_data['generates_idx'], exec_idx)
+
+        exec_to_trans = {}
+        trans_input_sets = {}
+        trans_output_sets = {}
+        for trans_idx, trans_data in self.transformations.items():
+            # Handle multiple executions per transformation
+            for exec_idx in trans_data['exec_indices']:
+                exec_to_trans.setdefault(exec_idx, trans_idx)
+            trans_input_sets[trans_idx] = frozenset(trans_data['IN_indices'])
+            trans_output_sets[trans_idx] = frozenset(trans_data['OUT_indices'])
 
-        exec_to_trace = {}
-        for trace_idx, trace_data in self.trace_models.items():
-            for exec_idx, exec_data in self.executions.items():
-                generates_idx = self.resolve_reference(exec_data['generates'])
-                if generates_idx == trace_idx:
-                    exec_to_trace[exec_idx] = trace_idx
-                    break
-
-        for trace_idx in self.trace_models.keys():
-            for exec_idx, exec_trace_idx in exec_to_trace.items():
-                if exec_trace_idx == trace_idx:
-                    for trans_idx, trans_data in self.transformations.items():
-                        # Handle multiple executions per transformation
-                        exec_ref_indices = self.resolve_references_list(trans_data['exec'])
-                        if exec_idx in exec_ref_indices:
-                            trace_to_transformation[trace_idx] = trans_idx
-                            break
-
-        # Collect all ancestor relationships first
-        ancestor_pairs = set()
-        for trace_idx, trace_data in self.trace_models.items():
+        exec_to_trace = {generates_to_exec[trace_idx]: trace_idx
+                         for trace_idx in trace_models
+                         if trace_idx in generates_to_exec}
+
+        # Map each model to the traces whose transformation consumes it
+        trace_to_transformation = {}
+        model_to_consuming_traces = defaultdict(set)
+        for exec_idx, trace_idx in exec_to_trace.items():
+            trans_idx = exec_to_trans.get(exec_idx)
+            if trans_idx is not None:
+                trace_to_transformation[trace_idx] = trans_idx
+                for in_idx in trans_input_sets[trans_idx]:
+                    model_to_consuming_traces[in_idx].add(trace_idx)
+
+        # Collect all ancestor relationships first, recorded on both traces so one probe
+        # covers both directions, and the evolution links (version evolution within
+        # same transformation) in the same pass
+        related_by_ancestry = defaultdict(set)
+        ancestor_links = []
+        resolve_reference = self.resolve_reference
+        for trace_idx, trace_data in trace_models.items():
             if trace_data.get('ancestor'):
-                ancestor_idx = self.resolve_reference(trace_data['ancestor'])
+                ancestor_idx = resolve_reference(trace_data['ancestor'])
                 if ancestor_idx is not None:
-                    ancestor_pairs.add((ancestor_idx, trace_idx))
+                    related_by_ancestry[trace_idx].add(ancestor_idx)
+                    related_by_ancestry[ancestor_idx].add(trace_idx)
+                    ancestor_links.append((ancestor_idx, trace_idx))
 
-        # Find latest version for each transformation
-        trans_to_latest_trace = {}
+        # Find latest version for each transformation (first trace wins on a tie)
+        trans_to_latest_trace = defaultdict(lambda: (None, float('-inf')))
         for trace_idx, trans_idx in trace_to_transformation.items():
-            trace_data = self.trace_models[trace_idx]
-            version = int(trace_data.get('version', 1))
-
-            if trans_idx not in trans_to_latest_trace:
+            version = trace_models[trace_idx]['version_int']
+            if version > trans_to_latest_trace[trans_idx][1]:
                 trans_to_latest_trace[trans_idx] = (trace_idx, version)
-            else:
-                current_latest_idx, current_version = trans_to_latest_trace[trans_idx]
-                if version > current_version:
-                    trans_to_latest_trace[trans_idx] = (trace_idx, version)
 
         # Extract just the trace indices of latest versions
         latest_trace_indices = {trace_idx for trace_idx, _ in trans_to_latest_trace.values()}
@@ -211,252 +337,338 @@ class GlobalTraceGeneratorD3:
             if trace_idx not in latest_trace_indices:
                 continue
 
-            trans_data = self.transformations[trans_idx]
-            output_models = self.resolve_references_list(trans_data['OUT'])
+            # Traces whose transformation consumes one of this transformation's outputs
+            consumer_traces = set()
+            for out_model in trans_output_sets[trans_idx]:
+                consumer_traces.update(model_to_consuming_traces.get(out_model, ()))
 
-            for other_trace_idx, other_trans_idx in trace_to_transformation.items():
+            related = related_by_ancestry.get(trace_idx, ())
+            for other_trace_idx in sorted(consumer_traces):
                 if trace_idx == other_trace_idx:
                     continue
 
                 # Skip if these traces have ancestor relationship
-                if (trace_idx, other_trace_idx) in ancestor_pairs or (other_trace_idx, trace_idx) in ancestor_pairs:
+                if other_trace_idx in related:
                     continue
 
-                other_trans_data = self.transformations[other_trans_idx]
-                input_models = self.resolve_references_list(other_trans_data['IN'])
-
-                if any(out_model in input_models for out_model in output_models):
-                    if trace_idx not in trace_dependencies:
-                        trace_dependencies[trace_idx] = []
-                    trace_dependencies[trace_idx].append(other_trace_idx)
+                if trace_idx not in trace_dependencies:
+                    trace_dependencies[trace_idx] = []
+                trace_dependencies[trace_idx].append(other_trace_idx)
 
         return {
             'trace_to_transformation': trace_to_transformation,
             'trace_dependencies': trace_dependencies,
-            'exec_to_trace': exec_to_trace
+            'exec_to_trace': exec_to_trace,
+            'ancestor_links': ancestor_links
         }
 
     def calculate_node_levels(self, dependencies: Dict) -> Dict[int, int]:
-        """Calculate the level of each node in the dependency graph using BFS"""
-        # Find source nodes (no incoming edges)
-        all_nodes = set(self.trace_models.keys())
-        nodes_with_incoming = set()
-        for targets in dependencies.values():
-            nodes_with_incoming.update(targets)
-
-        source_nodes = all_nodes - nodes_with_incoming
+        """Calculate the level (longest path from a source) of each node in the dependency graph"""
+        # Count incoming edges; source nodes have none
+        in_degree = dict.fromkeys(self.trace_models, 0)
+        in_degree.update(Counter(chain.from_iterable(dependencies.values())))
 
-        # BFS to calculate levels
-        levels = {}
-        queue = [(node, 0) for node in source_nodes]
+        # Kahn's topological order: a node is settled once all its parents are,
+        # so every node is visited once instead of once per path through it
+        queue = deque(node for node, degree in in_degree.items() if degree == 0)
+        levels = dict.fromkeys(queue, 0)
 
         while queue:
-            node, level = queue.pop(0)
-
-            # Update level if we found a longer path to this node
-            if node not in levels or level > levels[node]:
-                levels[node] = level
-
-                # Add children to queue
-                if node in dependencies:
-                    for child in dependencies[node]:
-                        queue.append((child, level + 1))
+            node = queue.popleft()
+            child_level = levels[node] + 1
+            for child in dependencies.get(node, ()):
+                if child_level > levels.get(child, -1):
+                    levels[child] = child_level
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    queue.append(child)
 
         return levels
 
     def generate_d3_html(self, global_trace: Dict, source_filename: str) -> str:
         """Generate interactive D3.js visualization with draggable nodes"""
+        graph_json = dumps_embedded_json(self.build_graph_data(global_trace))
+        return HTML_TEMPLATE.render(source_filename=source_filename, graph_json=graph_json)
+
+    def write_d3_html(self, global_trace: Dict, source_filename: str, f):
+        """Stream the visualization to the binary file f without building the page in memory"""
+        graph_data = self.build_graph_data(global_trace)
+        HTML_TEMPLATE.write(f, source_filename=source_filename,
+                            graph_json=lambda out: dump_embedded_json(graph_data, out))
+
+    def build_graph_data(self, global_trace: Dict) -> Dict:
+        """Build the node tables and link lists embedded in the page"""
         trace_to_trans = global_trace['trace_to_transformation']
         dependencies = global_trace['trace_dependencies']
 
         # Calculate node levels
         node_levels = self.calculate_node_levels(dependencies)
 
-        # Build nodes data - MODELS, TRACES, AND ELEMENT TRACES
-        nodes_data = []
-        element_trace_counter = 0
+        # Build nodes data - MODELS, TRACES, AND ELEMENT TRACES, one row tuple per node
+        model_rows = []
+        trace_rows = []
+        trace_link_rows = []
+        # Distinct node levels, so the page lays out its columns without a pass over the nodes
+        levels = set()
+
+        # Map each model to the first transformation producing it, and each
+        # transformation to its first trace, so model levels are two lookups
+        producing_trans = {}
+        for trans_idx, trans_data in self.transformations.items():
+            for out_idx in trans_data['OUT_indices']:
+                producing_trans.setdefault(out_idx, trans_idx)
+        trans_to_trace = {}
+        for trace_idx, trans_idx in trace_to_trans.items():
+            trans_to_trace.setdefault(trans_idx, trace_idx)
+
+        # Links refer to nodes by their position in the page's node list: models, then
+        # traces, then trace links. A reference to a missing node keeps its id string so
+        # d3 still reports it as not found
+        model_positions = {model_idx: pos for pos, model_idx in enumerate(self.models)}
+        trace_positions = {trace_idx: pos for pos, trace_idx in enumerate(self.trace_models, len(model_positions))}
+        first_trace_link_position = len(model_positions) + len(trace_positions)
+
+        # Resolve fills like an ordinal scale over ABSTRACTION_COLORS: other levels cycle
+        # through its colours in order of first use (models first, then trace links)
+        fills = dict(ABSTRACTION_COLORS)
+        palette = tuple(ABSTRACTION_COLORS.values())
+
+        def fill(level):
+            level = level or UNKNOWN
+            color = fills.get(level)
+            if color is None:
+                color = fills[level] = palette[len(fills) % len(palette)]
+            return color
 
         # Add Model nodes
+        mm_names = {}  # conformsTo reference -> metamodel name; many models share a metamodel
         for model_idx, model_data in self.models.items():
-            # Determine which level this model belongs to based on transformations
-            level = 0
-
-            # Check if this model is output of any transformation
-            for trans_idx, trans_data in self.transformations.items():
-                if trans_data['OUT']:
-                    out_indices = self.resolve_references_list(trans_data['OUT'])
-                    if model_idx in out_indices:
-                        # Find the trace for this transformation and use its level + 1
-                        # (output model is one level higher than the transformation trace)
-                        for trace_idx, trans_id in trace_to_trans.items():
-                            if trans_id == trans_idx:
-                                level = node_levels.get(trace_idx, 0) + 1
-                                break
-                        break
+            # A model produced by a transformation sits one level above that transformation's trace
+            trace_idx = trans_to_trace.get(producing_trans.get(model_idx))
+            level = node_levels.get(trace_idx, 0) + 1 if trace_idx is not None else 0
+            levels.add(level)
 
             # Get metamodel name
-            mm_name = 'Unknown'
-            if model_data['conformsTo']:
-                mm_idx = self.resolve_reference(model_data['conformsTo'])
-                if mm_idx in self.nodes:
-                    mm_name = self.nodes[mm_idx].get('name', 'Unknown')
-
-            nodes_data.append({
-                'id': f'model_{model_idx}',
-                'name': model_data['name'],
-                'type': 'model',
-                'metamodel': mm_name,
-                'level': level,
-                'LevelOfAbstraction': model_data.get('LevelOfAbstraction', 'Unknown')
-            })
-
-        # Add TraceModel nodes
+            conforms_to = model_data['conformsTo']
+            mm_name = mm_names.get(conforms_to)
+            if mm_name is None:
+                mm_name = UNKNOWN
+                if conforms_to:
+                    mm_idx = self.resolve_reference(conforms_to)
+                    if mm_idx in self.node_indices:
+                        mm_name = self.node_name(mm_idx)
+                mm_names[conforms_to] = mm_name
+
+            model_rows.append((
+                f'model_{model_idx}',
+                model_data['name'],
+                mm_name,
+                level,
+                model_data['LevelOfAbstraction'],
+                fill(model_data['LevelOfAbstraction'])
+            ))
+
+        # Add TraceModel nodes, plus the trace link nodes (separate from TraceModel) and
+        # containment links they hold, in one walk over each trace's rules
+        containment_links = []
+        transformations = self.transformations
+        models = self.models
+        node_name = self.node_name
+        node_indices = self.node_indices
+        trans_name_get = {i: t['name'] for i, t in transformations.items()}.get
+        trace_to_trans_get = trace_to_trans.get
+        trans_io_cache = {}
         for trace_idx, trace_data in self.trace_models.items():
-            trans_idx = trace_to_trans.get(trace_idx)
-            trans_name = self.transformations[trans_idx]['name'] if trans_idx else 'Unknown'
-
-            # Get input and output models for this transformation
-            input_models = []
-            output_models = []
-            trace_abstraction_level = 'Unknown'
-            if trans_idx:
-                trans_data = self.transformations[trans_idx]
-                if trans_data['IN']:
-                    in_indices = self.resolve_references_list(trans_data['IN'])
-                    input_models = [self.nodes[i].get('name', 'Unknown') for i in in_indices if i in self.nodes]
-                if trans_data['OUT']:
-                    out_indices = self.resolve_references_list(trans_data['OUT'])
-                    output_models = [self.nodes[i].get('name', 'Unknown') for i in out_indices if i in self.nodes]
-                    # Determine trace abstraction level from output model
-                    if out_indices:
-                        first_out_idx = out_indices[0]
-                        if first_out_idx in self.models:
-                            trace_abstraction_level = self.models[first_out_idx].get('LevelOfAbstraction', 'Unknown')
+            trans_idx = trace_to_trans_get(trace_idx)
+            trans_name = trans_name_get(trans_idx, UNKNOWN)
+            trace_id = f'trace_{trace_idx}'
+            trace_position = trace_positions[trace_idx]
+
+            # Get input and output models for this transformation, once per transformation
+            # since every version of a trace shares them
+            trans_io = trans_io_cache.get(trans_idx)
+            if trans_io is None:
+                input_models = []
+                output_models = []
+                trace_abstraction_level = UNKNOWN
+                if trans_idx is not None:
+                    trans_data = transformations[trans_idx]
+                    if trans_data['IN']:
+                        in_indices = trans_data['IN_indices']
+                        input_models = [node_name(i) for i in in_indices if i in node_indices]
+                    if trans_data['OUT']:
+                        out_indices = trans_data['OUT_indices']
+                        output_models = [node_name(i) for i in out_indices if i in node_indices]
+                        # Determine trace abstraction level from output model
+                        if out_indices:
+                            first_out_idx = out_indices[0]
+                            if first_out_idx in models:
+                                trace_abstraction_level = models[first_out_idx]['LevelOfAbstraction']
+                trans_io = trans_io_cache[trans_idx] = (input_models, output_models, trace_abstraction_level)
+            input_models, output_models, trace_abstraction_level = trans_io
 
             # Get node level
             level = node_levels.get(trace_idx, 0)
+            levels.add(level)
 
-            # Count attribute-level traces
+            # Count attribute-level traces and extract trace links from traced rules
+            # (every trace link that is not attribute-level is an element-level one)
             attr_traces = 0
-            element_traces = 0
+            link_count = 0
             for rule in trace_data['traced_rules']:
-                for link in rule['trace_links']:
-                    if isinstance(link, dict):
-                        if link.get('sourceAttribute') or link.get('targetAttribute'):
-                            attr_traces += 1
-                        else:
-                            element_traces += 1
-                    else:
-                        element_traces += 1
-
-            nodes_data.append({
-                'id': f'trace_{trace_idx}',
-                'name': trace_data['name'],
-                'type': 'trace',
-                'transformation': trans_name,
-                'input_models': input_models,
-                'output_models': output_models,
-                'num_rules': len(trace_data['traced_rules']),
-                'num_element_traces': element_traces,
-                'num_attribute_traces': attr_traces,
-                'traced_rules': trace_data['traced_rules'],
-                'level': level,
-                'version': trace_data.get('version', ''),
-                'LevelOfAbstraction': trace_abstraction_level
-            })
-
-        # Add trace link nodes (separate from TraceModel)
-        trace_link_nodes = []
-        for trace_idx, trace_data in self.trace_models.items():
-            trans_idx = trace_to_trans.get(trace_idx)
-            level = node_levels.get(trace_idx, 0)
-
-            # Determine abstraction level from output model
-            trace_abstraction_level = 'Unknown'
-            if trans_idx and trans_idx in self.transformations:
-                trans_data = self.transformations[trans_idx]
-                if trans_data['OUT']:
-                    out_indices = self.resolve_references_list(trans_data['OUT'])
-                    if out_indices and out_indices[0] in self.models:
-                        trace_abstraction_level = self.models[out_indices[0]].get('LevelOfAbstraction', 'Unknown')
-
-            # Extract trace links from traced rules
-            for rule in trace_data['traced_rules']:
-                for link in rule['trace_links']:
-                    if isinstance(link, dict) and (link.get('sourceElementPath') or link.get('targetElementPath')):
-                        trace_link_nodes.append({
-                            'id': f'tracelink_{trace_idx}_{len(trace_link_nodes)}',
-                            'name': link.get('name', 'Unnamed'),
-                            'type': 'trace_link',
-                            'sourceElementPath': link.get('sourceElementPath', ''),
-                            'targetElementPath': link.get('targetElementPath', ''),
-                            'linkType': link.get('linkType', ''),
-                            'level': level,
-                            'parent_trace_id': f'trace_{trace_idx}',
-                            'LevelOfAbstraction': trace_abstraction_level
-                        })
-
-        nodes_data.extend(trace_link_nodes)
+                trace_links = rule.trace_links
+                link_count += len(trace_links)
+                for link in trace_links:
+                    if link.source_attr or link.target_attr:
+                        attr_traces += 1
+
+                    if link.source_path or link.target_path:
+                        link_id = f'tracelink_{trace_idx}_{len(trace_link_rows)}'
+                        containment_links.append((trace_position, first_trace_link_position + len(trace_link_rows)))
+                        trace_link_rows.append((
+                            link_id,
+                            link.name,
+                            link.source_path,
+                            link.target_path,
+                            link.link_type,
+                            level,
+                            trace_id,
+                            trace_abstraction_level,
+                            fill(trace_abstraction_level)
+                        ))
+
+            trace_rows.append((
+                trace_id,
+                trace_data['name'],
+                trans_name,
+                input_models,
+                output_models,
+                len(trace_data['traced_rules']),
+                link_count - attr_traces,
+                attr_traces,
+                level,
+                trace_data['version'],
+                trace_abstraction_level
+            ))
 
         # Build links data - connecting Models and Traces
         links_data = []
 
         # Create links: Input Model → Trace → Output Model
         for trace_idx, trans_idx in trace_to_trans.items():
-            trans_data = self.transformations[trans_idx]
+            trans_data = transformations[trans_idx]
 
             # Get input models for this transformation
             if trans_data['IN']:
-                in_indices = self.resolve_references_list(trans_data['IN'])
+                in_indices = trans_data['IN_indices']
                 for in_idx in in_indices:
                     # Link: Input Model → Trace
-                    links_data.append({
-                        'source': f'model_{in_idx}',
-                        'target': f'trace_{trace_idx}',
-                        'type': 'model_to_trace'
-                    })
+                    links_data.append((model_positions.get(in_idx, f'model_{in_idx}'),
+                                       trace_positions[trace_idx], 'model_to_trace'))
 
             # Get output models for this transformation
             if trans_data['OUT']:
-                out_indices = self.resolve_references_list(trans_data['OUT'])
+                out_indices = trans_data['OUT_indices']
                 for out_idx in out_indices:
                     # Link: Trace → Output Model
-                    links_data.append({
-                        'source': f'trace_{trace_idx}',
-                        'target': f'model_{out_idx}',
-                        'type': 'trace_to_model'
-                    })
+                    links_data.append((trace_positions[trace_idx],
+                                       model_positions.get(out_idx, f'model_{out_idx}'), 'trace_to_model'))
 
-        # Create containment links from TraceModel to its trace links
-        containment_links = []
-        for link_node in trace_link_nodes:
-            containment_links.append({
-                'source': link_node['parent_trace_id'],
-                'target': link_node['id'],
-                'type': 'containment'
-            })
+        return {
+            'nodeTables': [
+                {'type': 'model', 'keys': MODEL_NODE_KEYS, 'rows': model_rows},
+                {'type': 'trace', 'keys': TRACE_NODE_KEYS, 'rows': trace_rows},
+                {'type': 'trace_link', 'keys': TRACE_LINK_NODE_KEYS, 'rows': trace_link_rows}
+            ],
+            'links': {'keys': LINK_KEYS, 'rows': links_data},
+            'containmentLinks': {'type': 'containment', 'keys': LINK_ENDPOINT_KEYS, 'rows': containment_links},
+            'ancestorLinks': {'type': 'evolution', 'keys': LINK_ENDPOINT_KEYS, 'rows': [
+                (trace_positions.get(ancestor_idx, f'trace_{ancestor_idx}'), trace_positions[trace_idx])
+                for ancestor_idx, trace_idx in global_trace['ancestor_links']]},
+            'levels': sorted(levels),
+            'abstractionColors': ABSTRACTION_COLORS
+        }
 
-        # Build ancestor links (version evolution within same transformation)
-        ancestor_links = []
-        for trace_idx, trace_data in self.trace_models.items():
-            if trace_data.get('ancestor'):
-                ancestor_idx = self.resolve_reference(trace_data['ancestor'])
-                if ancestor_idx is not None:
-                    ancestor_links.append({
-                        'source': f'trace_{ancestor_idx}',
-                        'target': f'trace_{trace_idx}',
-                        'type': 'evolution'
-                    })
-
-        # Generate HTML with embedded D3.js
-        html = f"""<!DOCTYPE html>
+    def print_transformation_io(self):
+        """Debug: print transformation I/O relationships"""
+        print("\n=== DEBUG: Transformation I/O Relationships ===")
+        for trans_idx, trans_data in self.transformations.items():
+            print(f"\nTransformation [{trans_idx}]: {trans_data['name']}")
+            print(f"  IN: {trans_data['IN']}")
+            print(f"  OUT: {trans_data['OUT']}")
+            if trans_data['IN']:
+                in_models = trans_data['IN_indices']
+                print(f"  Input Models: {[self.names[i] for i in in_models]}")
+            if trans_data['OUT']:
+                out_models = trans_data['OUT_indices']
+                print(f"  Output Models: {[self.names[i] for i in out_models]}")
+
+    def prepare_global_trace(self) -> Dict:
+        """Extract the megamodel and build its global trace"""
+        self.extract_all()
+
+        if self.debug:
+            self.print_transformation_io()
+
+        return self.build_global_trace()
+
+    def generate(self, source_filename: str) -> str:
+        """Main generation method"""
+        global_trace = self.prepare_global_trace()
+        return self.generate_d3_html(global_trace, source_filename)
+
+    def generate_to_file(self, source_filename: str, output_path: str):
+        """Generate the visualization straight into output_path"""
+        global_trace = self.prepare_global_trace()
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            self.write_d3_html(global_trace, source_filename, f)
+
+
+def write_gzip_copy(path: str) -> str:
+    """Write path.gz next to path, for servers that send it as-is with Content-Encoding: gzip"""
+    gz_path = path + '.gz'
+    with open(path, 'rb') as src, gzip.open(gz_path, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    return gz_path
+
+
+class HtmlTemplate:
+    """Page template with @@name placeholders so JS ${...} literals need no escaping"""
+
+    def __init__(self, template: str):
+        # Split once at import: even entries are literal text, odd entries placeholder names
+        self.chunks = re.split(r'@@(\w+)', template)
+
+        self.encoded_literals = [chunk.encode('utf-8') for chunk in self.chunks[0::2]]
+
+    def render(self, **values: str) -> str:
+        """Join the pre-split literal chunks with the placeholder values"""
+        chunks = list(self.chunks)
+        chunks[1::2] = [values[name] for name in chunks[1::2]]
+        return ''.join(chunks)
+
+    def write(self, f, **values):
+        """Write the page to the binary stream f; a callable value writes itself to f"""
+        names = self.chunks[1::2]
+        for literal, name in zip(self.encoded_literals, names):
+            f.write(literal)
+            value = values[name]
+            if callable(value):
+                value(f)
+            else:
+                f.write(value.encode('utf-8'))
+        f.write(self.encoded_literals[-1])
+
+
+# Static page scaffold; only the source name and the graph payload change per run
+HTML_TEMPLATE = HtmlTemplate("""<!DOCTYPE html>
 <html>
 <head>
     <meta charset="utf-8">
     <title>Global Trace Visualization - D3.js</title>
     <script src="https://d3js.org/d3.v7.min.js"></script>
     <style>
-        :root {{
+        :root {
             --bg-primary: #f5f5f5;
             --bg-secondary: white;
             --bg-graph: #fafafa;
@@ -469,9 +681,9 @@ class GlobalTraceGeneratorD3:
             --node-stroke: #fff;
             --tooltip-bg: rgba(0, 0, 0, 0.9);
             --tooltip-text: white;
-        }}
+        }
 
-        body.dark-mode {{
+        body.dark-mode {
             --bg-primary: #1a1a1a;
             --bg-secondary: #2d2d2d;
             --bg-graph: #242424;
@@ -484,9 +696,9 @@ class GlobalTraceGeneratorD3:
             --node-stroke: #2d2d2d;
             --tooltip-bg: rgba(255, 255, 255, 0.95);
             --tooltip-text: #1a1a1a;
-        }}
+        }
 
-        body {{
+        body {
             margin: 0;
             padding: 10px;
             font-family: Arial, sans-serif;
@@ -495,9 +707,9 @@ class GlobalTraceGeneratorD3:
             overflow: hidden;
             height: 100vh;
             box-sizing: border-box;
-        }}
+        }
 
-        #container {{
+        #container {
             background-color: var(--bg-secondary);
             border-radius: 8px;
             box-shadow: 0 2px 4px var(--shadow);
@@ -507,25 +719,25 @@ class GlobalTraceGeneratorD3:
             display: flex;
             flex-direction: column;
             box-sizing: border-box;
-        }}
+        }
 
-        h1 {{
+        h1 {
             text-align: center;
             color: var(--text-primary);
             margin-top: 0;
             transition: color 0.3s ease;
-        }}
+        }
 
-        .source-info {{
+        .source-info {
             text-align: center;
             color: var(--text-secondary);
             font-size: 14px;
             margin-bottom: 15px;
             font-style: italic;
             transition: color 0.3s ease;
-        }}
+        }
 
-        #graph {{
+        #graph {
             border: 1px solid var(--border-color);
             border-radius: 4px;
             background-color: var(--bg-graph);
@@ -534,50 +746,70 @@ class GlobalTraceGeneratorD3:
             width: 100%;
             flex: 1;
             min-height: 0;
-        }}
+        }
 
-        .link {{
+        .link {
             stroke: var(--link-color);
             stroke-opacity: 0.6;
             stroke-width: 2px;
             fill: none;
             marker-end: url(#arrowhead);
             transition: stroke 0.3s ease;
-        }}
+        }
 
-        .link:hover {{
+        .link:hover {
             stroke: var(--link-hover);
             stroke-opacity: 1;
             stroke-width: 3px;
-        }}
+        }
 
-        .node circle, .node rect, .node ellipse, .node path {{
+        /* Two-class selectors so these keep their colours on hover, as inline styles did */
+        .link.containment-link {
+            stroke: #4CAF50;
+            stroke-dasharray: 3,3;
+            stroke-width: 1.5px;
+        }
+
+        .link.ancestor-link {
+            stroke: #0066cc;
+            stroke-dasharray: 5,5;
+            stroke-width: 2px;
+        }
+
+        .node circle, .node rect, .node ellipse, .node path {
             stroke: var(--node-stroke);
             stroke-width: 3px;
             cursor: move;
             transition: stroke 0.3s ease;
-        }}
+        }
 
-        .node:hover circle, .node:hover rect, .node:hover ellipse, .node:hover path {{
+        .node:hover circle, .node:hover rect, .node:hover ellipse, .node:hover path {
             stroke-width: 5px;
-        }}
+        }
 
-        .node rect {{
+        .node rect {
             rx: 5;
             ry: 5;
-        }}
+        }
 
-        .node text {{
+        .node text {
             font-size: 12px;
             pointer-events: none;
             text-anchor: middle;
             font-weight: bold;
             fill: var(--text-primary);
             transition: fill 0.3s ease;
-        }}
+        }
+
+        .zoomed-out .node text {
+            display: none;
+        }
 
-        .tooltip {{
-            position: absolute;
+        .tooltip {
+            position: fixed;
+            left: 0;
+            top: 0;
+            will-change: transform;
             padding: 12px;
             background-color: var(--tooltip-bg);
             color: var(--tooltip-text);
@@ -589,36 +821,36 @@ class GlobalTraceGeneratorD3:
             max-width: 400px;
             box-shadow: 0 4px 6px var(--shadow);
             z-index: 1000;
-        }}
+        }
 
-        .legend {{
+        .legend {
             margin-top: 20px;
             text-align: center;
             font-size: 14px;
             color: var(--text-secondary);
             transition: color 0.3s ease;
-        }}
+        }
 
-        .legend-item {{
+        .legend-item {
             display: inline-block;
             margin: 0 15px;
-        }}
+        }
 
-        .legend-color {{
+        .legend-color {
             display: inline-block;
             width: 16px;
             height: 16px;
             border-radius: 50%;
             margin-right: 5px;
             vertical-align: middle;
-        }}
+        }
 
-        .controls {{
+        .controls {
             text-align: center;
             margin-bottom: 15px;
-        }}
+        }
 
-        button {{
+        button {
             padding: 8px 16px;
             margin: 0 5px;
             border: none;
@@ -631,43 +863,43 @@ class GlobalTraceGeneratorD3:
             min-height: 36px;
             vertical-align: middle;
             transition: background-color 0.3s ease, transform 0.1s ease;
-        }}
+        }
 
-        button:hover {{
+        button:hover {
             background-color: #45a049;
             transform: translateY(-1px);
-        }}
+        }
 
-        button:active {{
+        button:active {
             transform: translateY(0);
-        }}
+        }
 
-        #darkModeToggle {{
+        #darkModeToggle {
             background-color: #666;
             padding: 8px 16px;
             font-size: 14px;
             line-height: 1.4;
             min-height: 36px;
-        }}
+        }
 
-        #darkModeToggle:hover {{
+        #darkModeToggle:hover {
             background-color: #555;
-        }}
+        }
 
-        body.dark-mode #darkModeToggle {{
+        body.dark-mode #darkModeToggle {
             background-color: #f0f0f0;
             color: #1a1a1a;
-        }}
+        }
 
-        body.dark-mode #darkModeToggle:hover {{
+        body.dark-mode #darkModeToggle:hover {
             background-color: #e0e0e0;
-        }}
+        }
     </style>
 </head>
 <body>
     <div id="container">
         <h1>Global Trace Visualization</h1>
-        <div class="source-info">Source: {source_filename}</div>
+        <div class="source-info">Source: @@source_filename</div>
         <div class="controls">
             <button onclick="resetPositions()">Reset Positions</button>
             <button onclick="centerGraph()">Center View</button>
@@ -680,20 +912,36 @@ class GlobalTraceGeneratorD3:
     </div>
     <div class="tooltip" id="tooltip"></div>
 
+    <!-- Raw JSON, not a JS literal: JSON.parse is cheaper than compiling a large object literal -->
+    <script type="application/json" id="graph-data">@@graph_json</script>
+
     <script>
         // Data
-        const nodes = {json.dumps(nodes_data, indent=8)};
-        const links = {json.dumps(links_data, indent=8)};
-        const containmentLinks = {json.dumps(containment_links, indent=8)};
-        const ancestorLinks = {json.dumps(ancestor_links, indent=8)};
+        const DATA = JSON.parse(document.getElementById('graph-data').textContent);
+
+        // Rebuild node and link objects from their row tables; a table-wide type
+        // applies to every row
+        function tableObjects(table) {
+            return table.rows.map(row => {
+                const d = table.type === undefined ? {} : {type: table.type};
+                table.keys.forEach((key, i) => d[key] = row[i]);
+                return d;
+            });
+        }
+
+        const nodes = DATA.nodeTables.flatMap(tableObjects);
+        const links = tableObjects(DATA.links);
+        const containmentLinks = tableObjects(DATA.containmentLinks);
+        const ancestorLinks = tableObjects(DATA.ancestorLinks);
 
         // Combine all links for simulation
         const allLinks = [...links, ...containmentLinks, ...ancestorLinks];
 
-        // Color scale for LevelOfAbstraction - distinct colors for PIM, PSM, Code
+        // Color scale for LevelOfAbstraction - distinct colors for PIM, PSM, Code. Node
+        // fills are resolved by the generator; the legend reads the same colours
         const colorScale = d3.scaleOrdinal()
-            .domain(['PIM', 'PSM', 'Code', 'Unknown'])
-            .range(['#9C27B0', '#4CAF50', '#FFC107', '#666']);  // Purple for PIM, Green for PSM, Yellow for Code
+            .domain(Object.keys(DATA.abstractionColors))
+            .range(Object.values(DATA.abstractionColors));
 
         // Generate compact legend for LevelOfAbstraction
         const legend = d3.select("#legend");
@@ -701,7 +949,7 @@ class GlobalTraceGeneratorD3:
 
         // Compact color legend (inline)
         const colorLegend = legend.append("div").style("margin-bottom", "5px");
-        abstractionLevels.forEach((level, i) => {{
+        abstractionLevels.forEach((level, i) => {
             if (i > 0) colorLegend.append("span").html(" | ");
             colorLegend.append("span")
                 .attr("class", "legend-color")
@@ -713,7 +961,7 @@ class GlobalTraceGeneratorD3:
             colorLegend.append("span")
                 .style("font-size", "10px")
                 .text(level);
-        }});
+        });
 
         // Compact shape legend
         legend.append("div").attr("class", "legend-item").style("font-size", "9px")
@@ -732,7 +980,7 @@ class GlobalTraceGeneratorD3:
         const svg = d3.select("#graph")
             .attr("width", width)
             .attr("height", height)
-            .attr("viewBox", `0 0 ${{width}} ${{height}}`)
+            .attr("viewBox", `0 0 ${width} ${height}`)
             .attr("preserveAspectRatio", "xMidYMid meet");
 
         // Add arrowhead marker (smaller)
@@ -751,88 +999,130 @@ class GlobalTraceGeneratorD3:
         // Create zoom behavior
         const zoom = d3.zoom()
             .scaleExtent([0.1, 4])
-            .on("zoom", (event) => {{
+            .on("zoom", (event) => {
                 g.attr("transform", event.transform);
-            }});
+                // Level of detail: labels are unreadable when zoomed far out, so skip painting them
+                g.classed("zoomed-out", event.transform.k < 0.5);
+            });
 
         svg.call(zoom);
 
-        const g = svg.append("g");
+        // Built detached from the document and inserted once all links and nodes are in it
+        const g = d3.create("svg:g");
 
-        // Calculate level positions - arrange LEFT TO RIGHT (landscape)
-        const levels = [...new Set(nodes.map(d => d.level))].sort((a, b) => a - b);
+        // Calculate level positions - arrange LEFT TO RIGHT (landscape). The distinct levels
+        // come sorted from the generator; only the width is known here
+        const levels = DATA.levels;
         const levelWidth = width / (levels.length + 1);
-        const levelPositions = {{}};
-        levels.forEach((level, i) => {{
+        const levelPositions = {};
+        levels.forEach((level, i) => {
             levelPositions[level] = (i + 1) * levelWidth;
-        }});
-
-        // Force simulation - landscape orientation (horizontal)
-        const simulation = d3.forceSimulation(nodes)
-            .force("link", d3.forceLink(allLinks).id(d => d.id).distance(100))
-            .force("charge", d3.forceManyBody().strength(-300))
-            .force("x", d3.forceX(d => levelPositions[d.level]).strength(0.5))  // X axis for levels (horizontal)
-            .force("y", d3.forceY(height / 2).strength(0.1))  // Y axis for spreading (vertical)
-            .force("collision", d3.forceCollide().radius(d => {{
-                if (d.type === 'trace') return 45;
-                if (d.type === 'trace_link') return 55;
-                return 40;
-            }}));
+        });
+
+        // Force simulation - landscape orientation (horizontal). The forces are set up by a
+        // self-contained function so the layout worker below can run the same simulation
+        function applyForces(simulation, links, levelPositions, height) {
+            return simulation
+                // Link endpoints are node indices, d3's default id
+                .force("link", d3.forceLink(links).distance(100))
+                // Reuses the Barnes-Hut approximation across ticks when d3-force-reuse is loaded,
+                // which only the layout worker does; the main-thread simulation uses d3.forceManyBody
+                .force("charge", (d3.forceManyBodyReuse || d3.forceManyBody)().strength(-300))
+                .force("x", d3.forceX(d => levelPositions[d.level]).strength(0.5))  // X axis for levels (horizontal)
+                .force("y", d3.forceY(height / 2).strength(0.1))  // Y axis for spreading (vertical)
+                .force("collision", d3.forceCollide().radius(d => {
+                    if (d.type === 'trace') return 45;
+                    if (d.type === 'trace_link') return 55;
+                    return 40;
+                }))
+                // Settle sooner: d3 stops its timer (and the tick updates) once alpha drops
+                // below alphaMin, and dragging re-heats it through alphaTarget
+                .alphaMin(0.01);
+        }
+
+        const simulation = applyForces(d3.forceSimulation(nodes), allLinks, levelPositions, height);
+        // Kept so a reset can separate the nodes again the way the first layout did
+        const collision = simulation.force("collision");
+
+        // The layout is warmed up off-screen: the ticks the timer would have animated run
+        // without touching the DOM, and the settled positions are drawn once
+        simulation.stop();
+        const warmupTicks = Math.ceil(Math.log(simulation.alphaMin()) / Math.log(1 - simulation.alphaDecay()));
+
+        // Collision is only needed to pull the initial overlaps apart; it is the heaviest
+        // force, so it is dropped after the first ticks and the rest run without it
+        const COLLISION_TICKS = 100;
+        function runWarmup(simulation, ticks, collisionTicks) {
+            simulation.tick(Math.min(ticks, collisionTicks));
+            simulation.force("collision", null);
+            simulation.tick(Math.max(ticks - collisionTicks, 0));
+        }
+
+        // Warmup runs in a worker so the page stays responsive while it computes
+        const LAYOUT_WORKER = `
+            importScripts("https://d3js.org/d3.v7.min.js");
+            try {
+                importScripts("https://unpkg.com/d3-force-reuse@1.0.1");
+            } catch (e) {
+                // applyForces falls back to d3.forceManyBody
+            }
+            ${applyForces}
+            ${runWarmup}
+            onmessage = ({data}) => {
+                const simulation = applyForces(d3.forceSimulation(data.nodes), data.links,
+                                               data.levelPositions, data.height).stop();
+                runWarmup(simulation, data.ticks, data.collisionTicks);
+                const positions = new Float64Array(data.nodes.length * 2);
+                data.nodes.forEach((d, i) => {
+                    positions[2 * i] = d.x;
+                    positions[2 * i + 1] = d.y;
+                });
+                postMessage({positions, alpha: simulation.alpha()}, [positions.buffer]);
+            };
+        `;
 
         // Dependency links (solid) with arrows
         const link = g.append("g")
-            .selectAll("path")
+            .selectAll("line")
             .data(links)
-            .join("path")
+            .join("line")
             .attr("class", "link")
             .attr("marker-end", "url(#arrowhead)");
 
         // Containment links (dashed green) with arrows
         const containmentLink = g.append("g")
-            .selectAll("path")
+            .selectAll("line")
             .data(containmentLinks)
-            .join("path")
-            .attr("class", "link")
-            .attr("marker-end", "url(#arrowhead)")
-            .style("stroke", "#4CAF50")
-            .style("stroke-dasharray", "3,3")
-            .style("stroke-width", "1.5px");
+            .join("line")
+            .attr("class", "link containment-link")
+            .attr("marker-end", "url(#arrowhead)");
 
         // Ancestor links (dotted blue)
         const ancestorLink = g.append("g")
-            .selectAll("path")
+            .selectAll("line")
             .data(ancestorLinks)
-            .join("path")
-            .attr("class", "link")
-            .style("stroke", "#0066cc")
-            .style("stroke-dasharray", "5,5")
-            .style("stroke-width", "2px");
+            .join("line")
+            .attr("class", "link ancestor-link");
 
-        // Nodes
+        // Nodes, keyed by id; shapes and labels are only appended to entering nodes
         const node = g.append("g")
             .selectAll("g")
-            .data(nodes)
-            .join("g")
-            .attr("class", "node")
-            .call(d3.drag()
-                .on("start", dragstarted)
-                .on("drag", dragged)
-                .on("end", dragended));
+            .data(nodes, d => d.id)
+            .join(enter => {
+                const nodeGroup = enter.append("g")
+                    .attr("class", "node");
 
-        // Render different shapes based on type (SMALLER SIZES)
-        node.each(function(d) {{
-            const nodeGroup = d3.select(this);
-            if (d.type === 'model') {{
+                // Render different shapes based on type (SMALLER SIZES)
                 // Models as ellipses (SMALLER: 25x15 instead of 40x25)
-                nodeGroup.append("ellipse")
+                nodeGroup.filter(d => d.type === 'model').append("ellipse")
                     .attr("rx", 25)
                     .attr("ry", 15)
-                    .style("fill", d => colorScale(d.LevelOfAbstraction || 'Unknown'));
-            }} else if (d.type === 'trace') {{
+                    .style("fill", d => d.fill);
+
                 // Trace models as diamonds (SMALLER: 22 instead of 35)
                 const size = 22;
 
-                nodeGroup.append("rect")
+                nodeGroup.filter(d => d.type === 'trace').append("rect")
                     .attr("width", size)
                     .attr("height", size)
                     .attr("x", -size/2)
@@ -841,22 +1131,22 @@ class GlobalTraceGeneratorD3:
                     .style("fill", "#2196F3")  // Always blue for TraceModels
                     .style("stroke", "var(--text-primary)")
                     .style("stroke-width", 1);
-            }} else if (d.type === 'trace_link') {{
+
                 // Trace links as rounded rectangles (SMALLER)
                 const fontSize = 8;
                 const padding = 10;
                 const boxHeight = 20;
 
-                // Calculate width based on text length (smaller font)
-                const textWidth = d.name.length * 5;
-                const boxWidth = Math.max(80, textWidth + padding * 2);  // Min 80px
+                // Calculate width based on text length (smaller font), min 80px
+                const boxWidth = d => Math.max(80, d.name.length * 5 + padding * 2);
 
-                nodeGroup.append("rect")
+                const traceLinkGroup = nodeGroup.filter(d => d.type === 'trace_link');
+                traceLinkGroup.append("rect")
                     .attr("width", boxWidth)
                     .attr("height", boxHeight)
-                    .attr("x", -boxWidth/2)
+                    .attr("x", d => -boxWidth(d)/2)
                     .attr("y", -boxHeight/2)
-                    .style("fill", d => colorScale(d.LevelOfAbstraction || 'Unknown'))
+                    .style("fill", d => d.fill)
                     .style("fill-opacity", 0.8)
                     .style("rx", 5)
                     .style("ry", 5)
@@ -865,132 +1155,275 @@ class GlobalTraceGeneratorD3:
                     .style("stroke-opacity", 0.3);
 
                 // Show full name (smaller font)
-                nodeGroup.append("text")
+                traceLinkGroup.append("text")
                     .attr("y", 4)
                     .attr("text-anchor", "middle")
                     .style("font-size", fontSize + "px")
                     .style("fill", "var(--text-primary)")
                     .style("pointer-events", "none")
-                    .text(d.name);
-            }}
-        }});
-
-        // Add labels below nodes (SMALLER FONTS)
-        node.filter(d => d.type === 'model').append("text")
-            .attr("dy", 22)
-            .attr("text-anchor", "middle")
-            .style("font-size", "9px")
-            .style("fill", "var(--text-primary)")
-            .text(d => d.name);
-
-        node.filter(d => d.type === 'trace').append("text")
-            .attr("dy", 22)
-            .attr("text-anchor", "middle")
-            .style("font-size", "8px")
-            .style("font-weight", "bold")
-            .style("fill", "var(--text-primary)")
-            .text(d => d.name.replace(/_v\d+$/, ''));
+                    .text(d => d.name);
+
+                // Add labels below nodes (SMALLER FONTS)
+                nodeGroup.filter(d => d.type === 'model').append("text")
+                    .attr("dy", 22)
+                    .attr("text-anchor", "middle")
+                    .style("font-size", "9px")
+                    .style("fill", "var(--text-primary)")
+                    .text(d => d.name);
+
+                nodeGroup.filter(d => d.type === 'trace').append("text")
+                    .attr("dy", 22)
+                    .attr("text-anchor", "middle")
+                    .style("font-size", "8px")
+                    .style("font-weight", "bold")
+                    .style("fill", "var(--text-primary)")
+                    .text(d => d.name.replace(/_v\d+$/, ''));
+
+                return nodeGroup;
+            })
+            .call(d3.drag()
+                .on("start", dragstarted)
+                .on("drag", dragged)
+                .on("end", dragended));
+
+        svg.append(() => g.node());
 
         // Tooltip
         const tooltip = d3.select("#tooltip");
 
-        node.on("mouseenter", (event, d) => {{
-            let tooltipHTML = '';
-
-            if (d.type === 'model') {{
-                // Model tooltip
-                tooltipHTML = `
-                    <strong>${{d.name}}</strong><br/>
-                    <div style="margin-top: 3px;">Type: Model</div>
-                    <div>Abstraction: ${{d.LevelOfAbstraction}}</div>
-                    <div>Metamodel: ${{d.metamodel}}</div>
-                `;
-            }} else if (d.type === 'trace_link') {{
-                // Trace link tooltip
-                tooltipHTML = `
-                    <strong>Trace Link: ${{d.name}}</strong><br/>
-                    <div style="margin-top: 5px; font-size: 11px;">
-                        <div style="color: #6c6;">From: ${{d.sourceElementPath}}</div>
-                        <div style="color: #6cc; margin-top: 3px;">To: ${{d.targetElementPath}}</div>
-                    </div>
-                `;
-            }} else {{
-                // Trace model tooltip - simplified, no version or level
-                const displayName = d.name.replace(/_v\d+$/, '');
-                tooltipHTML = `
-                    <strong>${{displayName}}</strong><br/>
-                    <div style="margin-top: 3px;">Type: TraceModel</div>
-                    <div>Transformation: ${{d.transformation}}</div>
-                `;
-            }}
+        // One tooltip layout per node type (trace is the default), parsed only when the
+        // hovered type changes; hovering fills the fields in as text, so names never go
+        // through the HTML parser
+        const tooltipLayouts = {
+            model: `
+                <strong data-field="name"></strong><br/>
+                <div style="margin-top: 3px;">Type: Model</div>
+                <div>Abstraction: <span data-field="LevelOfAbstraction"></span></div>
+                <div>Metamodel: <span data-field="metamodel"></span></div>
+            `,
+            trace_link: `
+                <strong>Trace Link: <span data-field="name"></span></strong><br/>
+                <div style="margin-top: 5px; font-size: 11px;">
+                    <div style="color: #6c6;">From: <span data-field="sourceElementPath"></span></div>
+                    <div style="color: #6cc; margin-top: 3px;">To: <span data-field="targetElementPath"></span></div>
+                </div>
+            `,
+            // Trace model tooltip - simplified, no version or level
+            trace: `
+                <strong data-field="displayName"></strong><br/>
+                <div style="margin-top: 3px;">Type: TraceModel</div>
+                <div>Transformation: <span data-field="transformation"></span></div>
+            `
+        };
+        let tooltipType = null;
+        let tooltipFields = [];
+
+        function fillTooltip(d) {
+            const type = d.type in tooltipLayouts ? d.type : 'trace';
+            if (type !== tooltipType) {
+                tooltipType = type;
+                tooltip.html(tooltipLayouts[type]);
+                tooltipFields = tooltip.selectAll("[data-field]").nodes();
+            }
+            tooltipFields.forEach(el => {
+                const field = el.dataset.field;
+                el.textContent = String(field === 'displayName' ? d.name.replace(/_v\d+$/, '') : d[field]);
+            });
+        }
+
+        // One delegated listener pair for all nodes; moves between a node's own
+        // shapes are ignored so it behaves like per-node mouseenter/mouseleave
+        g.on("mouseover", (event) => {
+            const nodeEl = event.target.closest(".node");
+            if (!nodeEl || nodeEl.contains(event.relatedTarget)) return;
+            fillTooltip(nodeEl.__data__);
 
             tooltip
                 .style("opacity", 1)
-                .html(tooltipHTML)
-                .style("left", (event.pageX + 10) + "px")
-                .style("top", (event.pageY + 10) + "px");  // Position slightly below the cursor
-        }})
-        .on("mouseleave", () => {{
-            tooltip.style("opacity", 0);
-        }});
-
-        // Simulation tick
-        simulation.on("tick", () => {{
+                // Composited move instead of left/top, slightly below the cursor
+                .style("transform", `translate3d(${event.clientX + 10}px, ${event.clientY + 10}px, 0)`);
+        })
+        .on("mouseout", (event) => {
+            const nodeEl = event.target.closest(".node");
+            if (nodeEl && !nodeEl.contains(event.relatedTarget)) tooltip.style("opacity", 0);
+        });
+
+        // Viewport culling while the simulation runs: elements outside the visible area
+        // (plus a margin for shapes and labels) are hidden and their updates skipped.
+        // Once the simulation ends everything is positioned and shown again
+        const CULL_MARGIN = 100;
+
+        function visibleArea() {
+            const transform = d3.zoomTransform(svg.node());
+            const box = svg.node().viewBox.baseVal;
+            const [x0, y0] = transform.invert([box.x, box.y]);
+            const [x1, y1] = transform.invert([box.x + box.width, box.y + box.height]);
+            return {x0: x0 - CULL_MARGIN, y0: y0 - CULL_MARGIN, x1: x1 + CULL_MARGIN, y1: y1 + CULL_MARGIN};
+        }
+
+        function setCulled(el, culled) {
+            if (el.culled === culled) return;
+            el.culled = culled;
+            el.style.display = culled ? "none" : "";
+        }
+
+        // Raw elements and their data, collected once so renders are plain loops with no
+        // per-element callbacks
+        const linkLayers = [link, containmentLink, ancestorLink].map(selection => ({
+            elements: selection.nodes(),
+            data: selection.data()
+        }));
+        const nodeElements = node.nodes();
+        const nodeData = node.data();
+
+        // Each node keeps one SVGTransform that renders translate in place, so no
+        // transform string is built and parsed per node
+        const nodeTranslates = nodeElements.map(el =>
+            el.transform.baseVal.initialize(svg.node().createSVGTransform()));
+
+        // Links are straight segments, so <line> endpoints are set as plain numbers
+        // instead of building and parsing a path string per link
+        function positionLinks({elements, data}, area) {
+            for (let i = 0; i < elements.length; i++) {
+                const el = elements[i], s = data[i].source, t = data[i].target;
+                const visible = !area || (
+                    Math.max(s.x, t.x) >= area.x0 && Math.min(s.x, t.x) <= area.x1 &&
+                    Math.max(s.y, t.y) >= area.y0 && Math.min(s.y, t.y) <= area.y1);
+                setCulled(el, !visible);
+                if (visible) {
+                    el.x1.baseVal.value = s.x;
+                    el.y1.baseVal.value = s.y;
+                    el.x2.baseVal.value = t.x;
+                    el.y2.baseVal.value = t.y;
+                }
+            }
+        }
+
+        // Simulation tick (only fires once dragging or a reset restarts the simulation)
+        function render(cull) {
+            const area = cull ? visibleArea() : null;
+
             // Update all link types
-            link.attr("d", d => {{
-                return `M${{d.source.x}},${{d.source.y}} L${{d.target.x}},${{d.target.y}}`;
-            }});
+            linkLayers.forEach(layer => positionLinks(layer, area));
+
+            for (let i = 0; i < nodeElements.length; i++) {
+                const d = nodeData[i];
+                const visible = !area || (d.x >= area.x0 && d.x <= area.x1 && d.y >= area.y0 && d.y <= area.y1);
+                setCulled(nodeElements[i], !visible);
+                if (visible) nodeTranslates[i].setTranslate(d.x, d.y);
+            }
+        }
 
-            containmentLink.attr("d", d => {{
-                return `M${{d.source.x}},${{d.source.y}} L${{d.target.x}},${{d.target.y}}`;
-            }});
+        // Coalesce ticks into at most one DOM update per animation frame; the frame
+        // after the simulation ends renders without culling
+        let renderPending = false;
+        let renderCulled = true;
+        function scheduleRender(cull) {
+            renderCulled = cull;
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(() => {
+                renderPending = false;
+                render(renderCulled);
+            });
+        }
 
-            ancestorLink.attr("d", d => {{
-                return `M${{d.source.x}},${{d.source.y}} L${{d.target.x}},${{d.target.y}}`;
-            }});
+        // Ticks left before a reset drops collision again, following runWarmup's schedule
+        let collisionTicksLeft = 0;
 
-            node.attr("transform", d => `translate(${{d.x}},${{d.y}})`);
-        }});
+        simulation
+            .on("tick", () => {
+                if (collisionTicksLeft && --collisionTicksLeft === 0) simulation.force("collision", null);
+                scheduleRender(true);
+            })
+            .on("end", () => scheduleRender(false));
+
+        function showLayout() {
+            render(false);
+            g.style("visibility", null);
+        }
+
+        // Falls back to warming up on this thread where workers are unavailable
+        // (e.g. blob workers blocked on file:// pages, or the d3 import failing)
+        function warmUpHere() {
+            runWarmup(simulation, warmupTicks, COLLISION_TICKS);
+            showLayout();
+        }
+
+        g.style("visibility", "hidden");
+        let layoutWorker = null;
+        try {
+            layoutWorker = new Worker(URL.createObjectURL(new Blob([LAYOUT_WORKER], {type: "text/javascript"})));
+        } catch (e) {
+            warmUpHere();
+        }
+        if (layoutWorker) {
+            layoutWorker.onmessage = ({data}) => {
+                layoutWorker.terminate();
+                nodes.forEach((d, i) => {
+                    d.x = data.positions[2 * i];
+                    d.y = data.positions[2 * i + 1];
+                    d.vx = d.vy = 0;
+                });
+                simulation.alpha(data.alpha).force("collision", null);
+                showLayout();
+            };
+            layoutWorker.onerror = () => {
+                layoutWorker.terminate();
+                warmUpHere();
+            };
+            // Only what the forces read; link endpoints are node objects by now
+            layoutWorker.postMessage({
+                nodes: nodes.map(d => ({id: d.id, type: d.type, level: d.level})),
+                links: allLinks.map(l => ({source: l.source.index, target: l.target.index})),
+                levelPositions,
+                height,
+                ticks: warmupTicks,
+                collisionTicks: COLLISION_TICKS
+            });
+        }
 
         // Drag functions
-        function dragstarted(event, d) {{
+        function dragstarted(event, d) {
             if (!event.active) simulation.alphaTarget(0.3).restart();
             d.fx = d.x;
             d.fy = d.y;
-        }}
+        }
 
-        function dragged(event, d) {{
+        function dragged(event, d) {
             d.fx = event.x;
             d.fy = event.y;
-        }}
+        }
 
-        function dragended(event, d) {{
+        function dragended(event, d) {
             if (!event.active) simulation.alphaTarget(0);
             // Keep node fixed at dragged position
             // Uncomment next two lines to allow node to float after drag
             // d.fx = null;
             // d.fy = null;
-        }}
+        }
 
         // Reset positions
-        function resetPositions() {{
-            nodes.forEach(d => {{
+        function resetPositions() {
+            nodes.forEach(d => {
                 d.fx = null;
                 d.fy = null;
-            }});
+            });
+            simulation.force("collision", collision);
+            collisionTicksLeft = COLLISION_TICKS;
             simulation.alpha(1).restart();
-        }}
+        }
 
         // Center view
-        function centerGraph() {{
+        function centerGraph() {
             svg.transition().duration(750).call(
                 zoom.transform,
                 d3.zoomIdentity.translate(width / 2, height / 2).scale(1).translate(-width / 2, -height / 2)
             );
-        }}
+        }
 
         // Dark mode toggle
-        function toggleDarkMode() {{
+        function toggleDarkMode() {
             const body = document.body;
             const button = document.getElementById('darkModeToggle');
             const isDarkMode = body.classList.toggle('dark-mode');
@@ -1003,62 +1436,41 @@ class GlobalTraceGeneratorD3:
 
             // Update arrowhead marker color
             updateArrowheadColor(isDarkMode);
-        }}
+        }
 
         // Update arrowhead marker to match theme
-        function updateArrowheadColor(isDarkMode) {{
+        function updateArrowheadColor(isDarkMode) {
             const arrowColor = isDarkMode ? '#888' : '#999';
             d3.select('#arrowhead path').attr('fill', arrowColor);
-        }}
+        }
 
-        // Handle window resize
-        window.addEventListener('resize', () => {{
-            const newWidth = graphEl.clientWidth;
-            const newHeight = graphEl.clientHeight;
-            svg.attr("width", newWidth).attr("height", newHeight)
-               .attr("viewBox", `0 0 ${{newWidth}} ${{newHeight}}`);
-        }});
+        // Handle window resize, at most once per animation frame while the window is dragged
+        let resizeFrame = 0;
+        window.addEventListener('resize', () => {
+            cancelAnimationFrame(resizeFrame);
+            resizeFrame = requestAnimationFrame(() => {
+                const newWidth = graphEl.clientWidth;
+                const newHeight = graphEl.clientHeight;
+                svg.attr("width", newWidth).attr("height", newHeight)
+                   .attr("viewBox", `0 0 ${newWidth} ${newHeight}`);
+            });
+        });
 
         // Load dark mode preference on page load
-        window.addEventListener('DOMContentLoaded', () => {{
+        window.addEventListener('DOMContentLoaded', () => {
             const darkMode = localStorage.getItem('darkMode');
             const button = document.getElementById('darkModeToggle');
 
-            if (darkMode === 'enabled') {{
+            if (darkMode === 'enabled') {
                 document.body.classList.add('dark-mode');
                 button.textContent = '☀️ Light Mode';
                 updateArrowheadColor(true);
-            }}
-        }});
+            }
+        });
     </script>
 </body>
 </html>
-"""
-        return html
-
-    def generate(self, source_filename: str) -> str:
-        """Main generation method"""
-        self.parse_nodes()
-        self.extract_models()  # Extract Model nodes
-        self.extract_trace_models()
-        self.extract_transformation_executions()
-        self.extract_transformations()
-
-        # Debug: print transformation I/O relationships
-        print("\n=== DEBUG: Transformation I/O Relationships ===")
-        for trans_idx, trans_data in self.transformations.items():
-            print(f"\nTransformation [{trans_idx}]: {trans_data['name']}")
-            print(f"  IN: {trans_data['IN']}")
-            print(f"  OUT: {trans_data['OUT']}")
-            if trans_data['IN']:
-                in_models = self.resolve_references_list(trans_data['IN'])
-                print(f"  Input Models: {[self.nodes[i].get('name') for i in in_models]}")
-            if trans_data['OUT']:
-                out_models = self.resolve_references_list(trans_data['OUT'])
-                print(f"  Output Models: {[self.nodes[i].get('name') for i in out_models]}")
-
-        global_trace = self.build_global_trace()
-        return self.generate_d3_html(global_trace, source_filename)
+""")
 
 
 def main():
@@ -1078,6 +1490,16 @@ def main():
         default=None,
         help='Output HTML file path (default: output_g_trace/<xml_basename>.html)'
     )
+    parser.add_argument(
+        '--debug',
+        action='store_true',
+        help='Print transformation I/O relationships while generating'
+    )
+    parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Also write a gzip-compressed copy of the HTML (<output>.gz)'
+    )
 
     args = parser.parse_args()
 
@@ -1093,13 +1515,12 @@ def main():
     elif not os.path.dirname(args.output):
         args.output = os.path.join(output_dir, args.output)
 
-    generator = GlobalTraceGeneratorD3(args.example_xml)
-    result = generator.generate(args.example_xml)
-
-    with open(args.output, 'w') as f:
-        f.write(result)
+    generator = GlobalTraceGeneratorD3(args.example_xml, debug=args.debug)
+    generator.generate_to_file(args.example_xml, args.output)
 
     print(f"D3.js Global trace visualization saved to: {args.output}")
+    if args.gzip:
+        print(f"Compressed copy saved to: {write_gzip_copy(args.output)}")
     print(f"Source XML: {args.example_xml}")
 
 
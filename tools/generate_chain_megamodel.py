@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Synthetic chain megamodel generator for profiling the global trace generator
+
+Writes a megamodel of N chained transformations, Model_i -> T_i -> Model_i+1, each
+with one execution and one TraceModel holding a single element trace link. The
+"3000-chain test megamodel" quoted in size and timing notes is:
+
+    python tools/generate_chain_megamodel.py 3000 -o chain3000.xml
+    python generate_global_trace.py chain3000.xml -o chain3000.html
+"""
+
+import argparse
+import sys
+
+
+def chain_megamodel_lines(chain_length: int):
+    """Yield the XMI lines of a megamodel with chain_length chained transformations"""
+    yield '<?xml version="1.0" encoding="utf-8"?>'
+    yield ('<mpm_trace:Canvas xmi:version="2.0" xmlns:xmi="http://www.omg.org/XMI" '
+           'xmlns:mpm_trace="domain://MPM_trace">')
+    yield '<nodes xmi:type="mpm_trace:MetaModel" name="Ecore"/>'
+
+    # Each link of the chain is 4 nodes: model, transformation, execution, trace
+    for i in range(chain_length):
+        model_idx = 1 + 4 * i
+        trans_idx, exec_idx, trace_idx, next_model_idx = range(model_idx + 1, model_idx + 5)
+        yield (f'<nodes xmi:type="mpm_trace:Model" name="M{i}" LevelOfAbstraction="PSM" '
+               f'conformsTo="//@nodes.0" In="//@nodes.{trans_idx}"/>')
+        yield (f'<nodes xmi:type="mpm_trace:Transformation" name="T{i}" '
+               f'Out="//@nodes.{next_model_idx}" exec="//@nodes.{exec_idx}"/>')
+        yield (f'<nodes xmi:type="mpm_trace:TransformationExecution" name="E{i}" '
+               f'generates="//@nodes.{trace_idx}"/>')
+        yield (f'<nodes xmi:type="mpm_trace:TraceModel" name="TR{i}" version="1"><contains name="r">'
+               f'<traceLinks name="l{i}" sourceElementPath="a" targetElementPath="b"/></contains></nodes>')
+
+    yield f'<nodes xmi:type="mpm_trace:Model" name="M{chain_length}" LevelOfAbstraction="Code"/>'
+    yield '</mpm_trace:Canvas>'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic chain megamodel for profiling generate_global_trace.py'
+    )
+    parser.add_argument('chain_length', type=int, help='Number of chained transformations')
+    parser.add_argument('-o', '--output', help='Output XML file (default: stdout)')
+    args = parser.parse_args()
+
+    text = '\n'.join(chain_megamodel_lines(args.chain_length)) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == '__main__':
+    main()